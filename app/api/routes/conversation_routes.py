@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -8,29 +9,26 @@ from app.schemas.conversation import ConversationResponse, PaginatedConversation
 
 router = APIRouter()
 
-@router.get("/api/conversations/user/{user_id}", response_model=PaginatedConversationResponse)
+@router.get("/api/conversations/user/{user_id}", response_model=PaginatedConversationResponse, response_class=ORJSONResponse)
 async def get_conversations_for_user(
     user_id: UUID,
     page: int = 1,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    before_activity: Optional[datetime] = None,
+    cursor: Optional[str] = None,
     conversation_controller: ConversationController = Depends()
 ):
     """
     Get all conversations for a given user, ordered by most recent activity (DESC).
+    Later pages continue from the cursor of the previous response.
     """
-    try:
-        return await conversation_controller.get_user_conversations(
-            user_id=user_id,
-            page=page,
-            limit=limit
-        )
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve conversations: {str(e)}"
-        )
+    return await conversation_controller.get_user_conversations(
+        user_id=user_id,
+        page=page,
+        limit=limit,
+        before_activity=before_activity,
+        cursor=cursor
+    )
 
 @router.get("/api/conversations/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
@@ -40,12 +38,4 @@ async def get_conversation(
     """
     Get details of a specific conversation by ID
     """
-    try:
-        return await conversation_controller.get_conversation(conversation_id=conversation_id)
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve conversation: {str(e)}"
-        )
+    return await conversation_controller.get_conversation(conversation_id=conversation_id)
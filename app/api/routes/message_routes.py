@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -17,63 +18,57 @@ async def send_message(
     Send a message in a conversation. Also updates the user_conversations table 
     for each participant.
     """
-    try:
-        return await message_controller.send_message(message_data)
-    except HTTPException as e:
-        raise e
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to send message: {str(e)}"
-        )
+    return await message_controller.send_message(message_data)
 
-@router.get("/api/messages/conversation/{conversation_id}", response_model=PaginatedMessageResponse)
+@router.get("/api/messages/conversation/{conversation_id}", response_model=PaginatedMessageResponse, response_class=ORJSONResponse)
 async def get_messages_in_conversation(
     conversation_id: UUID,
     page: int = 1,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     message_controller: MessageController = Depends()
 ):
     """
     Retrieves messages in a conversation with pagination.
     Ordered by message_timestamp DESC from Cassandra schema.
+    Pages after the first require the cursor from the previous response.
     """
-    try:
-        return await message_controller.get_conversation_messages(
-            conversation_id=conversation_id,
-            page=page,
-            limit=limit
-        )
-    except HTTPException as e:
-        raise e
-    except Exception as e:
+    # Cassandra has no OFFSET, so later pages must continue from a cursor
+    if page > 1 and not cursor:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve messages: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="pass cursor from previous response.next_cursor"
         )
+    return await message_controller.get_conversation_messages(
+        conversation_id=conversation_id,
+        page=page,
+        limit=limit,
+        cursor=cursor
+    )
 
-@router.get("/api/messages/conversation/{conversation_id}/before", response_model=PaginatedMessageResponse)
+@router.get("/api/messages/conversation/{conversation_id}/before", response_model=PaginatedMessageResponse, response_class=ORJSONResponse)
 async def get_messages_before_timestamp(
     conversation_id: UUID,
     timestamp: datetime,
     page: int = 1,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     message_controller: MessageController = Depends()
 ):
     """
     Retrieves messages before a given timestamp with pagination.
+    Pages after the first require the cursor from the previous response.
     """
-    try:
-        return await message_controller.get_messages_before_timestamp(
-            conversation_id=conversation_id,
-            before_timestamp=timestamp,
-            page=page,
-            limit=limit
-        )
-    except HTTPException as e:
-        raise e
-    except Exception as e:
+    # Cassandra has no OFFSET, so later pages must continue from a cursor
+    if page > 1 and not cursor:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retrieve messages: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="pass cursor from previous response.next_cursor"
         )
+    return await message_controller.get_messages_before_timestamp(
+        conversation_id=conversation_id,
+        before_timestamp=timestamp,
+        page=page,
+        limit=limit,
+        cursor=cursor
+    )
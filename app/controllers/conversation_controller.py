@@ -1,10 +1,10 @@
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime
 from fastapi import HTTPException, status
 
 from app.schemas.conversation import ConversationResponse, PaginatedConversationResponse
-from app.models.cassandra_models import ConversationModel
+from app.models.cassandra_models import ConversationModel, decode_conversation_cursor
 
 class ConversationController:
     """
@@ -15,7 +15,9 @@ class ConversationController:
         self, 
         user_id: UUID, 
         page: int = 1, 
-        limit: int = 20
+        limit: int = 20,
+        before_activity: Optional[datetime] = None,
+        cursor: Optional[str] = None
     ) -> PaginatedConversationResponse:
         """
         Get all conversations for a user with pagination
@@ -24,42 +26,45 @@ class ConversationController:
             user_id: ID of the user
             page: Page number
             limit: Number of conversations per page
+            before_activity: Only return conversations active before this timestamp
+            cursor: next_cursor from the previous page
             
         Returns:
             Paginated list of conversations
             
         Raises:
-            HTTPException: If user not found or access denied
+            HTTPException: If the cursor is malformed
+            Exception: If the conversations cannot be read (returned as a 500)
         """
-        try:
-            conversations, total = await ConversationModel.get_user_conversations(
-                user_id=user_id,
-                page=page,
-                limit=limit
-            )
-            
-            # Convert model data to schema response format
-            conversation_responses = [
-                ConversationResponse(
-                    conversation_id=conv['conversation_id'],
-                    user_id=conv['user_id'],
-                    participant_ids=list(conv['participant_ids']) if conv['participant_ids'] else [],
-                    last_activity=conv['last_activity'],
-                    last_message_preview=conv['last_message_preview']
-                ) for conv in conversations
-            ]
-            
-            return PaginatedConversationResponse(
-                total=total,
-                page=page,
-                limit=limit,
-                data=conversation_responses
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get user conversations: {str(e)}"
-            )
+        cursor_activity, cursor_conversation_id = self._decode_cursor(cursor)
+        
+        conversations, next_cursor = await ConversationModel.get_user_conversations(
+            user_id=user_id,
+            page=page,
+            limit=limit,
+            before_activity=before_activity,
+            cursor_activity=cursor_activity,
+            cursor_conversation_id=cursor_conversation_id
+        )
+        
+        # Rows come typed from the driver, so skip re-validation
+        conversation_responses = [
+            ConversationResponse.model_construct(
+                conversation_id=conv.conversation_id,
+                user_id=conv.user_id,
+                participant_ids=conv.participant_ids or [],
+                last_activity=conv.last_activity,
+                last_message_preview=conv.last_message_preview
+            ) for conv in conversations
+        ]
+        
+        return PaginatedConversationResponse(
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            page=page,
+            limit=limit,
+            data=conversation_responses
+        )
     
     async def get_conversation(self, conversation_id: UUID) -> ConversationResponse:
         """
@@ -72,31 +77,49 @@ class ConversationController:
             Conversation details
             
         Raises:
-            HTTPException: If conversation not found or access denied
+            HTTPException: If the conversation has no participants
+            Exception: If the conversation is not found or cannot be read (returned as a 500)
         """
-        try:
-            conversation = await ConversationModel.get_conversation(conversation_id=conversation_id)
+        conversation = await ConversationModel.get_conversation(conversation_id=conversation_id)
+        
+        # Since we don't have user_id in this query, we'll use the first participant as the user
+        user_id = conversation.participant_ids[0] if conversation.participant_ids else None
+        
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation has no participants"
+            )
             
-            # Since we don't have user_id in this query, we'll use the first participant as the user
-            user_id = list(conversation['participant_ids'])[0] if conversation['participant_ids'] else None
+        # participant_ids is already a list of UUIDs from the driver
+        return ConversationResponse.model_construct(
+            conversation_id=conversation.conversation_id,
+            user_id=user_id,
+            participant_ids=conversation.participant_ids,
+            last_activity=conversation.last_activity,
+            last_message_preview=conversation.last_message_preview
+        )
+    
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[UUID]]:
+        """
+        Decode a pagination cursor sent by the client
+        
+        Args:
+            cursor: next_cursor from the previous page, if any
             
-            if not user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Conversation has no participants"
-                )
-                
-            return ConversationResponse(
-                conversation_id=conversation['conversation_id'],
-                user_id=user_id,
-                participant_ids=list(conversation['participant_ids']),
-                last_activity=datetime.utcnow(),  # Placeholder as this isn't in our query
-                last_message_preview=""  # Placeholder as this isn't in our query
-            )
-        except HTTPException as e:
-            raise e
-        except Exception as e:
+        Returns:
+            Tuple of (cursor last activity, cursor conversation ID), both None without a cursor
+            
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        if cursor is None:
+            return None, None
+        try:
+            return decode_conversation_cursor(cursor)
+        except ValueError as e:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get conversation: {str(e)}"
-            ) 
\ No newline at end of file
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
@@ -1,10 +1,11 @@
-from typing import Optional, List
+import asyncio
+from typing import Optional, List, Tuple
 from datetime import datetime
 from uuid import UUID
 from fastapi import HTTPException, status
 
 from app.schemas.message import MessageCreate, MessageResponse, PaginatedMessageResponse
-from app.models.cassandra_models import MessageModel
+from app.models.cassandra_models import MessageModel, decode_message_cursor
 
 class MessageController:
     """
@@ -22,34 +23,29 @@ class MessageController:
             The created message with metadata
         
         Raises:
-            HTTPException: If message sending fails
+            Exception: If the message cannot be stored (returned as a 500)
         """
-        try:
-            message_id = await MessageModel.create_message(
-                conversation_id=message_data.conversation_id,
-                sender_id=message_data.sender_id,
-                message_text=message_data.message_text,
-                participant_ids=message_data.participant_ids if hasattr(message_data, 'participant_ids') else None
-            )
-            
-            return MessageResponse(
-                message_id=message_id,
-                sender_id=message_data.sender_id,
-                message_text=message_data.message_text,
-                message_timestamp=datetime.utcnow(),
-                conversation_id=message_data.conversation_id
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to send message: {str(e)}"
-            )
+        message_id = await MessageModel.create_message(
+            conversation_id=message_data.conversation_id,
+            sender_id=message_data.sender_id,
+            message_text=message_data.message_text,
+            participant_ids=message_data.participant_ids if hasattr(message_data, 'participant_ids') else None
+        )
+        
+        return MessageResponse(
+            message_id=message_id,
+            sender_id=message_data.sender_id,
+            message_text=message_data.message_text,
+            message_timestamp=datetime.utcnow(),
+            conversation_id=message_data.conversation_id
+        )
     
     async def get_conversation_messages(
         self, 
         conversation_id: UUID, 
         page: int = 1, 
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> PaginatedMessageResponse:
         """
         Get all messages in a conversation with pagination
@@ -58,49 +54,55 @@ class MessageController:
             conversation_id: ID of the conversation
             page: Page number
             limit: Number of messages per page
+            cursor: next_cursor from the previous page
             
         Returns:
             Paginated list of messages
             
         Raises:
-            HTTPException: If conversation not found or access denied
+            HTTPException: If the cursor is malformed
+            Exception: If the messages cannot be read (returned as a 500)
         """
-        try:
-            messages, total = await MessageModel.get_conversation_messages(
+        cursor_timestamp, cursor_message_id = self._decode_cursor(cursor)
+        
+        (messages, next_cursor), total = await asyncio.gather(
+            MessageModel.get_conversation_messages(
                 conversation_id=conversation_id,
                 page=page,
-                limit=limit
-            )
-            
-            # Convert model data to schema response format
-            message_responses = [
-                MessageResponse(
-                    message_id=msg['message_id'],
-                    sender_id=msg['sender_id'],
-                    message_text=msg['message_text'],
-                    message_timestamp=msg['message_timestamp'],
-                    conversation_id=msg['conversation_id']
-                ) for msg in messages
-            ]
-            
-            return PaginatedMessageResponse(
-                total=total,
-                page=page,
                 limit=limit,
-                data=message_responses
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get conversation messages: {str(e)}"
-            )
+                cursor_timestamp=cursor_timestamp,
+                cursor_message_id=cursor_message_id
+            ),
+            MessageModel.get_message_count(conversation_id)
+        )
+        
+        # Rows come typed from the driver, so skip re-validation
+        message_responses = [
+            MessageResponse.model_construct(
+                message_id=msg.message_id,
+                sender_id=msg.sender_id,
+                message_text=msg.message_text,
+                message_timestamp=msg.message_timestamp,
+                conversation_id=msg.conversation_id
+            ) for msg in messages
+        ]
+        
+        return PaginatedMessageResponse(
+            total=total,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            page=page,
+            limit=limit,
+            data=message_responses
+        )
     
     async def get_messages_before_timestamp(
         self, 
         conversation_id: UUID, 
         before_timestamp: datetime,
         page: int = 1, 
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None
     ) -> PaginatedMessageResponse:
         """
         Get messages in a conversation before a specific timestamp with pagination
@@ -110,40 +112,68 @@ class MessageController:
             before_timestamp: Get messages before this timestamp
             page: Page number
             limit: Number of messages per page
+            cursor: next_cursor from the previous page
             
         Returns:
             Paginated list of messages
             
         Raises:
-            HTTPException: If conversation not found or access denied
+            HTTPException: If the cursor is malformed
+            Exception: If the messages cannot be read (returned as a 500)
         """
-        try:
-            messages, total = await MessageModel.get_messages_before_timestamp(
-                conversation_id=conversation_id,
-                before_timestamp=before_timestamp,
-                page=page,
-                limit=limit
-            )
+        cursor_timestamp, cursor_message_id = self._decode_cursor(cursor)
+        
+        # The counter only tracks the whole conversation, not the messages
+        # before a timestamp, so no total is reported for this query
+        messages, next_cursor = await MessageModel.get_messages_before_timestamp(
+            conversation_id=conversation_id,
+            before_timestamp=before_timestamp,
+            page=page,
+            limit=limit,
+            cursor_timestamp=cursor_timestamp,
+            cursor_message_id=cursor_message_id
+        )
+        
+        # Rows come typed from the driver, so skip re-validation
+        message_responses = [
+            MessageResponse.model_construct(
+                message_id=msg.message_id,
+                sender_id=msg.sender_id,
+                message_text=msg.message_text,
+                message_timestamp=msg.message_timestamp,
+                conversation_id=msg.conversation_id
+            ) for msg in messages
+        ]
+        
+        return PaginatedMessageResponse(
+            total=None,
+            next_cursor=next_cursor,
+            has_more=next_cursor is not None,
+            page=page,
+            limit=limit,
+            data=message_responses
+        )
+    
+    @staticmethod
+    def _decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[UUID]]:
+        """
+        Decode a pagination cursor sent by the client
+        
+        Args:
+            cursor: next_cursor from the previous page, if any
             
-            # Convert model data to schema response format
-            message_responses = [
-                MessageResponse(
-                    message_id=msg['message_id'],
-                    sender_id=msg['sender_id'],
-                    message_text=msg['message_text'],
-                    message_timestamp=msg['message_timestamp'],
-                    conversation_id=msg['conversation_id']
-                ) for msg in messages
-            ]
+        Returns:
+            Tuple of (cursor timestamp, cursor message ID), both None without a cursor
             
-            return PaginatedMessageResponse(
-                total=total,
-                page=page,
-                limit=limit,
-                data=message_responses
-            )
-        except Exception as e:
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        if cursor is None:
+            return None, None
+        try:
+            return decode_message_cursor(cursor)
+        except ValueError as e:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get messages before timestamp: {str(e)}"
-            ) 
\ No newline at end of file
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
\ No newline at end of file
@@ -4,13 +4,15 @@ This provides a connection to the Cassandra database.
 """
 import os
 import uuid
-from typing import List, Dict, Any, Optional
+import asyncio
+import threading
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
 from cassandra.cluster import Cluster, Session
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.query import SimpleStatement, dict_factory
+from cassandra.query import PreparedStatement, SimpleStatement, Statement, named_tuple_factory
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,8 @@ class CassandraClient:
         
         self.cluster = None
         self.session = None
+        self._prepared: Dict[Tuple[str, str], PreparedStatement] = {}
+        self._prepare_lock = threading.Lock()
         self.connect()
         
         self._initialized = True
@@ -45,7 +49,10 @@ class CassandraClient:
         try:
             self.cluster = Cluster([self.host])
             self.session = self.cluster.connect(self.keyspace)
-            self.session.row_factory = dict_factory
+            # Named tuples give cheap attribute access to columns
+            self.session.row_factory = named_tuple_factory
+            # Prepared statements belong to the previous session
+            self._prepared.clear()
             logger.info(f"Connected to Cassandra at {self.host}:{self.port}, keyspace: {self.keyspace}")
         except Exception as e:
             logger.error(f"Failed to connect to Cassandra: {str(e)}")
@@ -57,24 +64,46 @@ class CassandraClient:
             self.cluster.shutdown()
             logger.info("Cassandra connection closed")
     
-    def execute(self, query: str, params: dict = None) -> List[Dict[str, Any]]:
+    def prepare(self, query: str) -> PreparedStatement:
+        """
+        Prepare a CQL query once and reuse the statement on later calls.
+        
+        Args:
+            query: The CQL query string, using `?` bind markers
+            
+        Returns:
+            The cached prepared statement
+        """
+        if not self.session:
+            self.connect()
+        
+        key = (self.keyspace, query)
+        statement = self._prepared.get(key)
+        if statement is None:
+            with self._prepare_lock:
+                statement = self._prepared.get(key)
+                if statement is None:
+                    statement = self.session.prepare(query)
+                    self._prepared[key] = statement
+        return statement
+    
+    def execute(self, query: Union[str, Statement, PreparedStatement], params: dict = None) -> List[Tuple]:
         """
         Execute a CQL query.
         
         Args:
-            query: The CQL query string
+            query: The CQL query string or a prepared statement
             params: The parameters for the query
             
         Returns:
-            List of rows as dictionaries
+            List of rows as named tuples
         """
         if not self.session:
             self.connect()
         
         try:
-            # For now, we're just using a synchronous execution since this is a demo
-            # In a real app, we'd use asyncio and the asynchronous driver
-            statement = SimpleStatement(query)
+            # Blocks the calling thread; use execute_async from coroutines
+            statement = SimpleStatement(query) if isinstance(query, str) else query
             
             # Convert UUID objects in params to string representations
             if isinstance(params, dict):
@@ -88,32 +117,72 @@ class CassandraClient:
                 result = self.session.execute(statement, processed_params)
             else:
                 result = self.session.execute(statement, params or [])
-                
+            
+            # A single-page result already holds its rows in a list
+            if not result.has_more_pages:
+                return result.current_rows
             return list(result)
         except Exception as e:
             logger.error(f"Query execution failed: {str(e)}")
             raise
     
-    def execute_async(self, query: str, params: dict = None):
+    def execute_async(
+        self, 
+        query: Union[str, Statement, PreparedStatement], 
+        params: dict = None
+    ) -> "asyncio.Future[List[Tuple]]":
         """
         Execute a CQL query asynchronously.
         
+        Must be called from a running event loop.
+        
         Args:
-            query: The CQL query string
+            query: The CQL query string or a prepared statement
             params: The parameters for the query
             
         Returns:
-            Async result object
+            Awaitable resolving to the list of rows as named tuples, across all pages
         """
         if not self.session:
             self.connect()
         
         try:
-            statement = SimpleStatement(query)
-            return self.session.execute_async(statement, params or {})
+            statement = SimpleStatement(query) if isinstance(query, str) else query
+            response_future = self.session.execute_async(statement, params or [])
         except Exception as e:
             logger.error(f"Async query execution failed: {str(e)}")
             raise
+        
+        # The driver resolves ResponseFutures on its own event thread, so hand
+        # the outcome back to the asyncio loop in a thread-safe way
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        rows = []
+        
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+        
+        def set_exception(exc):
+            if not future.done():
+                future.set_exception(exc)
+        
+        def on_page(page_rows):
+            if response_future.has_more_pages:
+                # Keep this page before requesting the next one: the next
+                # callback may run on the driver thread before this returns
+                rows.extend(page_rows)
+                response_future.start_fetching_next_page()
+            else:
+                rows.extend(page_rows or [])
+                loop.call_soon_threadsafe(set_result, rows)
+        
+        def on_error(exc):
+            logger.error(f"Async query execution failed: {str(exc)}")
+            loop.call_soon_threadsafe(set_exception, exc)
+        
+        response_future.add_callbacks(on_page, on_error)
+        return future
     
     def get_session(self) -> Session:
         """Get the Cassandra session."""
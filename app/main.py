@@ -1,6 +1,7 @@
 import logging
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import sys
 import os
 
@@ -19,9 +20,51 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="FB Messenger API",
     description="Backend API for FB Messenger implementation using Cassandra",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+class UnhandledErrorMiddleware:
+    """
+    Return a 500 for any error not already raised as an HTTPException.
+    
+    An exception handler for Exception would run in Starlette's outermost
+    ServerErrorMiddleware, outside CORS, so its responses would lack the
+    CORS headers. Catching errors here keeps them inside the CORS layer.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late to replace a response that is already being sent
+            if response_started:
+                raise
+            logger.exception(f"Unhandled error on {scope['method']} {scope['path']}: {str(exc)}")
+            response = ORJSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": str(exc)}
+            )
+            await response(scope, receive, send)
+
+# Middleware added first sits innermost, so CORS wraps the error responses
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -1,13 +1,249 @@
 """
 Models for interacting with Cassandra tables.
 """
+import asyncio
+import base64
 import uuid
 from uuid import UUID
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple, Set
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, Set
+
+from async_lru import alru_cache
+from cassandra import WriteTimeout
+from cassandra.policies import WriteType
+from cassandra.query import BatchStatement, BatchType, PreparedStatement
 
 from app.db.cassandra_client import cassandra_client
 
+# Largest page size accepted by the paginated queries
+MAX_PAGE_SIZE = 100
+
+# Row limits the paginated queries are prepared with. A request is rounded
+# up to the next one, which bounds the number of prepared statements; the
+# pagination helpers trim the extra rows.
+PAGE_FETCH_SIZES = (11, 21, 51, MAX_PAGE_SIZE + 1)
+
+# Bounds for the in-process conversation cache
+CONVERSATION_CACHE_SIZE = 10_000
+CONVERSATION_CACHE_TTL = 60  # seconds
+
+# CQL statements, prepared once per keyspace by cassandra_client.prepare.
+# Paginated queries inline their LIMIT, see _prepare_page_query.
+_INSERT_MESSAGE_CQL = """
+INSERT INTO messages_by_conversation (
+    conversation_id, message_timestamp, message_id, sender_id, message_text
+) VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPSERT_USER_CONVERSATION_CQL = """
+INSERT INTO user_conversations (
+    user_id, last_activity, conversation_id, participant_ids, last_message_preview
+) VALUES (?, ?, ?, ?, ?)
+"""
+
+_UPSERT_CONVERSATION_CQL = """
+INSERT INTO conversations_by_id (
+    conversation_id, participant_ids, last_activity, last_message_preview
+) VALUES (?, ?, ?, ?)
+"""
+
+_UPDATE_CONVERSATION_ACTIVITY_CQL = """
+UPDATE conversations_by_id SET last_activity = ?, last_message_preview = ?
+WHERE conversation_id = ?
+"""
+
+_INCREMENT_MESSAGE_COUNT_CQL = """
+UPDATE conversation_counters SET msg_count = msg_count + 1
+WHERE conversation_id = ?
+"""
+
+_SELECT_MESSAGE_COUNT_CQL = """
+SELECT msg_count FROM conversation_counters
+WHERE conversation_id = ?
+"""
+
+_SELECT_MESSAGES_CQL = """
+SELECT conversation_id, message_timestamp, message_id, sender_id, message_text
+FROM messages_by_conversation
+WHERE conversation_id = ?
+ORDER BY message_timestamp DESC
+LIMIT {limit}
+"""
+
+_SELECT_MESSAGES_BEFORE_CQL = """
+SELECT conversation_id, message_timestamp, message_id, sender_id, message_text
+FROM messages_by_conversation
+WHERE conversation_id = ? AND message_timestamp < ?
+ORDER BY message_timestamp DESC
+LIMIT {limit}
+"""
+
+# Rows sharing the cursor's timestamp come back in message_id order, so the
+# rest of that timestamp is the rows after the cursor's message_id
+_SELECT_MESSAGES_AT_CQL = """
+SELECT conversation_id, message_timestamp, message_id, sender_id, message_text
+FROM messages_by_conversation
+WHERE conversation_id = ? AND message_timestamp = ? AND message_id > ?
+LIMIT {limit}
+"""
+
+_SELECT_USER_CONVERSATIONS_CQL = """
+SELECT user_id, last_activity, conversation_id, participant_ids, last_message_preview
+FROM user_conversations
+WHERE user_id = ?
+ORDER BY last_activity DESC
+LIMIT {limit}
+"""
+
+_SELECT_USER_CONVERSATIONS_BEFORE_CQL = """
+SELECT user_id, last_activity, conversation_id, participant_ids, last_message_preview
+FROM user_conversations
+WHERE user_id = ? AND last_activity < ?
+ORDER BY last_activity DESC
+LIMIT {limit}
+"""
+
+# Same tie-break as _SELECT_MESSAGES_AT_CQL, on (last_activity, conversation_id)
+_SELECT_USER_CONVERSATIONS_AT_CQL = """
+SELECT user_id, last_activity, conversation_id, participant_ids, last_message_preview
+FROM user_conversations
+WHERE user_id = ? AND last_activity = ? AND conversation_id > ?
+LIMIT {limit}
+"""
+
+_SELECT_CONVERSATION_CQL = """
+SELECT conversation_id, participant_ids, last_activity, last_message_preview
+FROM conversations_by_id
+WHERE conversation_id = ?
+"""
+
+_SELECT_CONVERSATION_BY_PAIR_CQL = """
+SELECT conversation_id FROM conversation_by_user_pair
+WHERE user_low = ? AND user_high = ?
+"""
+
+# Lightweight transaction, so only one conversation ever claims a pair
+_INSERT_CONVERSATION_BY_PAIR_CQL = """
+INSERT INTO conversation_by_user_pair (
+    user_low, user_high, conversation_id
+) VALUES (?, ?, ?)
+IF NOT EXISTS
+"""
+
+# Releases a claim, but only while it still belongs to the given conversation
+_DELETE_CONVERSATION_BY_PAIR_CQL = """
+DELETE FROM conversation_by_user_pair
+WHERE user_low = ? AND user_high = ?
+IF conversation_id = ?
+"""
+
+
+def encode_message_cursor(message_timestamp: datetime, message_id: UUID) -> str:
+    """
+    Serialize the position of a message into an opaque, URL-safe cursor.
+    
+    Args:
+        message_timestamp: Timestamp of the last message on the page
+        message_id: ID of the last message on the page
+        
+    Returns:
+        Base64 encoded cursor
+    """
+    raw = f"{message_timestamp.isoformat()}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_message_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Parse a cursor produced by encode_message_cursor.
+    
+    Args:
+        cursor: Base64 encoded cursor from a previous page
+        
+    Returns:
+        Tuple of (message timestamp, message ID)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        message_timestamp, message_id = raw.split("|")
+        return datetime.fromisoformat(message_timestamp), UUID(message_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def encode_conversation_cursor(last_activity: datetime, conversation_id: UUID) -> str:
+    """
+    Serialize the position of a user's conversation into an opaque cursor.
+    
+    Args:
+        last_activity: Last activity of the last conversation on the page
+        conversation_id: ID of the last conversation on the page
+        
+    Returns:
+        Base64 encoded cursor
+    """
+    return encode_message_cursor(last_activity, conversation_id)
+
+
+def decode_conversation_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Parse a cursor produced by encode_conversation_cursor.
+    
+    Args:
+        cursor: Base64 encoded cursor from a previous page
+        
+    Returns:
+        Tuple of (last activity, conversation ID)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    return decode_message_cursor(cursor)
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    """
+    Normalize a datetime to the naive UTC form the driver returns.
+    
+    Args:
+        value: Naive (assumed UTC) or timezone-aware datetime
+        
+    Returns:
+        Naive datetime in UTC
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _prepare_page_query(query: str, limit: int) -> PreparedStatement:
+    """
+    Prepare a paginated query for at least `limit` rows.
+    
+    The limit is inlined as a literal rather than bound, and rounded up to
+    one of PAGE_FETCH_SIZES, so each template has a fixed set of prepared
+    statements no matter which page sizes clients ask for.
+    
+    Args:
+        query: CQL template with a `{limit}` placeholder
+        limit: Minimum number of rows to fetch
+        
+    Returns:
+        The cached prepared statement
+    """
+    # The limit ends up in the CQL text, so only accept a small int
+    if type(limit) is not int or not 0 < limit <= MAX_PAGE_SIZE + 1:
+        raise ValueError(f"Invalid page size: {limit!r}")
+    fetch_size = next(size for size in PAGE_FETCH_SIZES if size >= limit)
+    statement = cassandra_client.prepare(query.format(limit=fetch_size))
+    # Fetch the whole page in one round trip
+    statement.fetch_size = fetch_size
+    return statement
+
+
 class MessageModel:
     """
     Message model for interacting with the messages table.
@@ -15,6 +251,8 @@ class MessageModel:
     Tables:
     - messages_by_conversation: stores messages in a conversation
     - user_conversations: stores user's conversations with recent activity
+    - conversations_by_id: stores the latest state of each conversation
+    - conversation_counters: stores the number of messages per conversation
     """
     
     @staticmethod
@@ -40,86 +278,126 @@ class MessageModel:
         message_timestamp = datetime.utcnow()
         
         try:
+            # If participant_ids not provided, default to just the sender
+            participants_known = bool(participant_ids)
+            if not participants_known:
+                participant_ids = [sender_id]
+            
             # Insert the message into messages_by_conversation table
-            insert_query = """
-            INSERT INTO messages_by_conversation (
-                conversation_id, message_timestamp, message_id, sender_id, message_text
-            ) VALUES (%s, %s, %s, %s, %s)
-            """
-            cassandra_client.execute(insert_query, (
+            writes = [cassandra_client.execute_async(cassandra_client.prepare(_INSERT_MESSAGE_CQL), (
                 conversation_id,
                 message_timestamp,
                 message_id,
                 sender_id,
                 message_text
-            ))
-            
-            # If participant_ids not provided, default to just the sender
-            if not participant_ids:
-                participant_ids = [sender_id]
+            ))]
                 
-            # Update the user_conversations table for each participant
-            for user_id in participant_ids:
-                update_query = """
-                INSERT INTO user_conversations (
-                    user_id, last_activity, conversation_id, participant_ids, last_message_preview
-                ) VALUES (%s, %s, %s, %s, %s)
-                """
-                last_message_preview = message_text[:100]
-                cassandra_client.execute(update_query, (
+            # Update the user_conversations table for each participant in a
+            # single unlogged batch; the rows live in different partitions, so
+            # the batch only saves round trips and gives no atomicity
+            update_statement = cassandra_client.prepare(_UPSERT_USER_CONVERSATION_CQL)
+            # participant_ids is a frozen list, stored sorted and deduplicated
+            participants_list = sorted(set(participant_ids))
+            last_message_preview = message_text[:100]
+            batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for user_id in participants_list:
+                batch.add(update_statement, (
                     user_id,
                     message_timestamp,
                     conversation_id,
-                    set(participant_ids),
+                    participants_list,
                     last_message_preview
                 ))
+            writes.append(cassandra_client.execute_async(batch))
+            
+            # Keep the per-conversation summary in sync for direct lookups.
+            # Without real participants, leave the stored list untouched.
+            if participants_known:
+                writes.append(cassandra_client.execute_async(cassandra_client.prepare(_UPSERT_CONVERSATION_CQL), (
+                    conversation_id,
+                    participants_list,
+                    message_timestamp,
+                    last_message_preview
+                )))
+            else:
+                writes.append(cassandra_client.execute_async(cassandra_client.prepare(_UPDATE_CONVERSATION_ACTIVITY_CQL), (
+                    message_timestamp,
+                    last_message_preview,
+                    conversation_id
+                )))
+            
+            # Counter updates cannot share a batch with regular writes. Counters
+            # are not idempotent, so this is the only place that increments it.
+            writes.append(cassandra_client.execute_async(
+                cassandra_client.prepare(_INCREMENT_MESSAGE_COUNT_CQL),
+                (conversation_id,)
+            ))
+            
+            # All writes are independent, so wait for them together
+            await asyncio.gather(*writes)
+            ConversationModel._get_conversation_cached.cache_invalidate(conversation_id)
                 
             return message_id
         except Exception as e:
             raise Exception(f"Failed to create message: {str(e)}")
     
+    @staticmethod
+    async def get_message_count(conversation_id: UUID) -> int:
+        """
+        Get the number of messages in a conversation.
+        
+        Reads the denormalized counter maintained by create_message instead
+        of counting the partition.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            
+        Returns:
+            Total number of messages
+        """
+        try:
+            result = await cassandra_client.execute_async(
+                cassandra_client.prepare(_SELECT_MESSAGE_COUNT_CQL),
+                (conversation_id,)
+            )
+            
+            return result[0].msg_count if result else 0
+        except Exception as e:
+            raise Exception(f"Failed to get message count: {str(e)}")
+    
     @staticmethod
     async def get_conversation_messages(
         conversation_id: UUID, 
         page: int = 1, 
-        limit: int = 20
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        limit: int = 20,
+        cursor_timestamp: Optional[datetime] = None,
+        cursor_message_id: Optional[UUID] = None
+    ) -> Tuple[List[Tuple], Optional[str]]:
         """
-        Get messages for a conversation with pagination.
+        Get messages for a conversation with keyset pagination.
         
         Args:
             conversation_id: The ID of the conversation
             page: The page number
             limit: Number of messages per page
+            cursor_timestamp: Timestamp of the last message of the previous page
+            cursor_message_id: ID of the last message of the previous page
             
         Returns:
-            Tuple of (messages list, total count)
+            Tuple of (messages list, next page cursor or None)
         """
         try:
-            if page < 1:
-                page = 1
-                
-            # First get the total count
-            count_query = """
-            SELECT COUNT(*) as count FROM messages_by_conversation
-            WHERE conversation_id = %s
-            """
-            count_result = cassandra_client.execute(count_query, (conversation_id,))
-            total = count_result[0]['count'] if count_result else 0
-            
-            # Then get the paginated results
-            # Note: Cassandra doesn't directly support OFFSET, so for a real 
-            # implementation we'd use token-based pagination
-            select_query = """
-            SELECT conversation_id, message_timestamp, message_id, sender_id, message_text
-            FROM messages_by_conversation
-            WHERE conversation_id = %s
-            ORDER BY message_timestamp DESC
-            LIMIT %s
-            """
-            rows = cassandra_client.execute(select_query, (conversation_id, limit))
+            if cursor_timestamp is None:
+                rows = await cassandra_client.execute_async(
+                    _prepare_page_query(_SELECT_MESSAGES_CQL, limit + 1),
+                    (conversation_id,)
+                )
+            else:
+                rows = await MessageModel._fetch_after_cursor(
+                    conversation_id, limit, cursor_timestamp, cursor_message_id
+                )
             
-            return list(rows), total
+            return MessageModel._page_with_cursor(rows, limit)
         except Exception as e:
             raise Exception(f"Failed to get conversation messages: {str(e)}")
     
@@ -128,52 +406,108 @@ class MessageModel:
         conversation_id: UUID, 
         before_timestamp: datetime,
         page: int = 1, 
-        limit: int = 20
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        limit: int = 20,
+        cursor_timestamp: Optional[datetime] = None,
+        cursor_message_id: Optional[UUID] = None
+    ) -> Tuple[List[Tuple], Optional[str]]:
         """
-        Get messages before a timestamp with pagination.
+        Get messages before a timestamp with keyset pagination.
         
         Args:
             conversation_id: The ID of the conversation
             before_timestamp: Get messages before this timestamp
             page: The page number
             limit: Number of messages per page
+            cursor_timestamp: Timestamp of the last message of the previous page
+            cursor_message_id: ID of the last message of the previous page
             
         Returns:
-            Tuple of (messages list, total count)
+            Tuple of (messages list, next page cursor or None)
         """
         try:
-            if page < 1:
-                page = 1
-                
-            # First get the total count
-            count_query = """
-            SELECT COUNT(*) as count FROM messages_by_conversation
-            WHERE conversation_id = %s AND message_timestamp < %s
-            """
-            count_result = cassandra_client.execute(count_query, (
-                conversation_id,
-                before_timestamp
-            ))
-            total = count_result[0]['count'] if count_result else 0
+            # Cursors decode to naive UTC, while the client may send an offset
+            before_timestamp = _to_naive_utc(before_timestamp)
             
-            # Then get the paginated results
-            select_query = """
-            SELECT conversation_id, message_timestamp, message_id, sender_id, message_text
-            FROM messages_by_conversation
-            WHERE conversation_id = %s AND message_timestamp < %s
-            ORDER BY message_timestamp DESC
-            LIMIT %s
-            """
-            rows = cassandra_client.execute(select_query, (
-                conversation_id,
-                before_timestamp,
-                limit
-            ))
+            # The cursor always points further back than the original bound
+            if cursor_timestamp is not None and cursor_timestamp < before_timestamp:
+                rows = await MessageModel._fetch_after_cursor(
+                    conversation_id, limit, cursor_timestamp, cursor_message_id
+                )
+            else:
+                rows = await cassandra_client.execute_async(
+                    _prepare_page_query(_SELECT_MESSAGES_BEFORE_CQL, limit + 1),
+                    (conversation_id, before_timestamp)
+                )
             
-            return list(rows), total
+            return MessageModel._page_with_cursor(rows, limit)
         except Exception as e:
             raise Exception(f"Failed to get messages before timestamp: {str(e)}")
+    
+    @staticmethod
+    async def _fetch_after_cursor(
+        conversation_id: UUID,
+        limit: int,
+        cursor_timestamp: datetime,
+        cursor_message_id: Optional[UUID]
+    ) -> List[Tuple]:
+        """
+        Fetch at least `limit + 1` messages following a cursor position, if available.
+        
+        Messages sharing the cursor's timestamp are fetched separately and
+        placed ahead of the older ones, so a page boundary inside one
+        timestamp does not skip the rest of it.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            limit: Number of messages per page
+            cursor_timestamp: Timestamp of the last message of the previous page
+            cursor_message_id: ID of the last message of the previous page
+            
+        Returns:
+            Messages in page order, possibly more than `limit + 1`
+        """
+        older = cassandra_client.execute_async(
+            _prepare_page_query(_SELECT_MESSAGES_BEFORE_CQL, limit + 1),
+            (conversation_id, cursor_timestamp)
+        )
+        if cursor_message_id is None:
+            return await older
+        
+        same_timestamp, older_rows = await asyncio.gather(
+            cassandra_client.execute_async(
+                _prepare_page_query(_SELECT_MESSAGES_AT_CQL, limit + 1),
+                (conversation_id, cursor_timestamp, cursor_message_id)
+            ),
+            older
+        )
+        same_timestamp.extend(older_rows)
+        return same_timestamp
+    
+    @staticmethod
+    def _page_with_cursor(
+        rows: List[Tuple], 
+        limit: int
+    ) -> Tuple[List[Tuple], Optional[str]]:
+        """
+        Trim a `limit + 1` result to one page and build the cursor for the next one.
+        
+        Args:
+            rows: At least the first `limit + 1` rows after the previous page
+            limit: Number of messages per page
+            
+        Returns:
+            Tuple of (messages list, next page cursor or None)
+        """
+        if len(rows) <= limit:
+            return rows, None
+        
+        # Drop the look-ahead row in place instead of copying the page
+        del rows[limit:]
+        last_row = rows[-1]
+        return rows, encode_message_cursor(
+            last_row.message_timestamp,
+            last_row.message_id
+        )
 
 
 class ConversationModel:
@@ -185,50 +519,97 @@ class ConversationModel:
     async def get_user_conversations(
         user_id: UUID, 
         page: int = 1, 
-        limit: int = 20
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        limit: int = 20,
+        before_activity: Optional[datetime] = None,
+        cursor_activity: Optional[datetime] = None,
+        cursor_conversation_id: Optional[UUID] = None
+    ) -> Tuple[List[Tuple], Optional[str]]:
         """
-        Get conversations for a user with pagination.
+        Get conversations for a user with keyset pagination.
         
         Args:
             user_id: The ID of the user
             page: The page number
             limit: Number of conversations per page
+            before_activity: Only return conversations active before this timestamp
+            cursor_activity: Last activity of the last conversation of the previous page
+            cursor_conversation_id: ID of the last conversation of the previous page
             
         Returns:
-            Tuple of (conversations list, total count)
+            Tuple of (conversations list, next page cursor or None)
         """
         try:
-            if page < 1:
-                page = 1
-                
-            # First get the total count
-            count_query = """
-            SELECT COUNT(*) as count FROM user_conversations
-            WHERE user_id = %s
-            """
-            count_result = cassandra_client.execute(count_query, (user_id,))
-            total = count_result[0]['count'] if count_result else 0
+            if before_activity is not None:
+                # Cursors decode to naive UTC, while the client may send an offset
+                before_activity = _to_naive_utc(before_activity)
+            
+            # The cursor always points further back than the original bound
+            if cursor_activity is not None and (before_activity is None or cursor_activity < before_activity):
+                older = cassandra_client.execute_async(
+                    _prepare_page_query(_SELECT_USER_CONVERSATIONS_BEFORE_CQL, limit + 1),
+                    (user_id, cursor_activity)
+                )
+                if cursor_conversation_id is None:
+                    rows = await older
+                else:
+                    # Conversations sharing the cursor's activity come first
+                    rows, older_rows = await asyncio.gather(
+                        cassandra_client.execute_async(
+                            _prepare_page_query(_SELECT_USER_CONVERSATIONS_AT_CQL, limit + 1),
+                            (user_id, cursor_activity, cursor_conversation_id)
+                        ),
+                        older
+                    )
+                    rows.extend(older_rows)
+            elif before_activity is None:
+                rows = await cassandra_client.execute_async(
+                    _prepare_page_query(_SELECT_USER_CONVERSATIONS_CQL, limit + 1),
+                    (user_id,)
+                )
+            else:
+                rows = await cassandra_client.execute_async(
+                    _prepare_page_query(_SELECT_USER_CONVERSATIONS_BEFORE_CQL, limit + 1),
+                    (user_id, before_activity)
+                )
             
-            # Then get the paginated results
-            select_query = """
-            SELECT user_id, last_activity, conversation_id, participant_ids, last_message_preview
-            FROM user_conversations
-            WHERE user_id = %s
-            ORDER BY last_activity DESC
-            LIMIT %s
-            """
-            rows = cassandra_client.execute(select_query, (user_id, limit))
+            if len(rows) <= limit:
+                return rows, None
             
-            return list(rows), total
+            del rows[limit:]
+            last_row = rows[-1]
+            return rows, encode_conversation_cursor(
+                last_row.last_activity,
+                last_row.conversation_id
+            )
         except Exception as e:
             raise Exception(f"Failed to get user conversations: {str(e)}")
     
     @staticmethod
-    async def get_conversation(conversation_id: UUID) -> Dict[str, Any]:
+    async def get_conversation(conversation_id: UUID) -> Tuple:
         """
         Get a conversation by ID.
         
+        Results are cached in process for a short time; create_message
+        invalidates the entry of the conversation it writes to.
+        
+        Args:
+            conversation_id: The ID of the conversation
+            
+        Returns:
+            Conversation details
+        """
+        return await ConversationModel._get_conversation_cached(conversation_id)
+    
+    @staticmethod
+    @alru_cache(maxsize=CONVERSATION_CACHE_SIZE, ttl=CONVERSATION_CACHE_TTL)
+    async def _get_conversation_cached(conversation_id: UUID) -> Tuple:
+        """
+        Fetch a conversation by ID through the in-process cache.
+        
+        The cache key depends on how the arguments are passed, so this is
+        always called with conversation_id as the only positional argument,
+        matching cache_invalidate in create_message.
+        
         Args:
             conversation_id: The ID of the conversation
             
@@ -236,13 +617,10 @@ class ConversationModel:
             Conversation details
         """
         try:
-            query = """
-            SELECT conversation_id, participant_ids
-            FROM user_conversations
-            WHERE conversation_id = %s
-            LIMIT 1
-            """
-            result = cassandra_client.execute(query, (conversation_id,))
+            result = await cassandra_client.execute_async(
+                cassandra_client.prepare(_SELECT_CONVERSATION_CQL),
+                (conversation_id,)
+            )
             
             if not result:
                 raise Exception(f"Conversation {conversation_id} not found")
@@ -267,44 +645,76 @@ class ConversationModel:
             Tuple of (conversation_id, was_created)
         """
         try:
-            # Try to find existing conversation
-            query = """
-            SELECT conversation_id FROM user_conversations
-            WHERE user_id = %s
-            """
-            result = cassandra_client.execute(query, (user_id,))
+            # The pair table is keyed on the ordered pair of user IDs
+            user_low, user_high = sorted((user_id, other_user_id))
+            result = await cassandra_client.execute_async(
+                cassandra_client.prepare(_SELECT_CONVERSATION_BY_PAIR_CQL),
+                (user_low, user_high)
+            )
             
-            # Iterate through conversations to find one with just these two participants
-            for row in result:
-                conv_id = row['conversation_id']
-                # Get this conversation's details
-                conv_details = await ConversationModel.get_conversation(conv_id)
-                participants = conv_details['participant_ids']
-                
-                # If this conversation has exactly these two participants, return it
-                if participants and len(participants) == 2 and user_id in participants and other_user_id in participants:
-                    return conv_id, False
+            if result:
+                return result[0].conversation_id, False
                     
             # If no matching conversation found, create a new one
             new_conversation_id = uuid.uuid4()
-            participant_ids = [user_id, other_user_id]
+            participant_ids = [user_low, user_high]
             timestamp = datetime.utcnow()
             
-            # Insert for both users
+            # Claim the pair first; a concurrent caller may have created the
+            # conversation since the lookup above, in which case reuse it
+            result = await cassandra_client.execute_async(
+                cassandra_client.prepare(_INSERT_CONVERSATION_BY_PAIR_CQL),
+                (user_low, user_high, new_conversation_id)
+            )
+            # The first column of a conditional write's result is [applied]
+            if not result[0][0]:
+                return result[0].conversation_id, False
+            
+            # Write both users' rows and the conversation summary atomically
+            batch = BatchStatement(batch_type=BatchType.LOGGED)
+            insert_statement = cassandra_client.prepare(_UPSERT_USER_CONVERSATION_CQL)
             for uid in participant_ids:
-                query = """
-                INSERT INTO user_conversations (
-                    user_id, last_activity, conversation_id, participant_ids, last_message_preview
-                ) VALUES (%s, %s, %s, %s, %s)
-                """
-                cassandra_client.execute(query, (
+                batch.add(insert_statement, (
                     uid,
                     timestamp,
                     new_conversation_id,
-                    set(participant_ids),
+                    participant_ids,
                     "New conversation"
                 ))
+            batch.add(cassandra_client.prepare(_UPSERT_CONVERSATION_CQL), (
+                new_conversation_id,
+                participant_ids,
+                timestamp,
+                "New conversation"
+            ))
+            try:
+                await cassandra_client.execute_async(batch)
+            except WriteTimeout as e:
+                # Once the batch log is written, the batch is replayed until it
+                # applies, so the conversation will exist and keeps the claim
+                if e.write_type != WriteType.BATCH:
+                    await ConversationModel._release_pair(user_low, user_high, new_conversation_id)
+                raise
+            except Exception:
+                # Otherwise the pair would point at a conversation with no rows
+                await ConversationModel._release_pair(user_low, user_high, new_conversation_id)
+                raise
                 
             return new_conversation_id, True
         except Exception as e:
-            raise Exception(f"Failed to create or get conversation: {str(e)}") 
\ No newline at end of file
+            raise Exception(f"Failed to create or get conversation: {str(e)}") 
+    
+    @staticmethod
+    async def _release_pair(user_low: UUID, user_high: UUID, conversation_id: UUID) -> None:
+        """
+        Drop a user pair claim whose conversation could not be written.
+        
+        Args:
+            user_low: The lower of the two user IDs
+            user_high: The higher of the two user IDs
+            conversation_id: The conversation the claim was made for
+        """
+        await cassandra_client.execute_async(
+            cassandra_client.prepare(_DELETE_CONVERSATION_BY_PAIR_CQL),
+            (user_low, user_high, conversation_id)
+        )
@@ -19,7 +19,8 @@ class PaginatedConversationRequest(BaseModel):
     limit: int = Field(20, description="Number of items per page")
 
 class PaginatedConversationResponse(BaseModel):
-    total: int = Field(..., description="Total number of conversations")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for fetching the next page")
+    has_more: bool = Field(..., description="Whether more conversations are available")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Number of items per page")
     data: List[ConversationResponse] = Field(..., description="List of conversations") 
\ No newline at end of file
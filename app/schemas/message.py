@@ -24,7 +24,9 @@ class PaginatedMessageRequest(BaseModel):
     before_timestamp: Optional[datetime] = Field(None, description="Get messages before this timestamp")
 
 class PaginatedMessageResponse(BaseModel):
-    total: int = Field(..., description="Total number of messages")
+    total: Optional[int] = Field(None, description="Total number of messages in the conversation, or None when filtering by timestamp")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for fetching the next page")
+    has_more: bool = Field(..., description="Whether more messages are available")
     page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Number of items per page")
     data: List[MessageResponse] = Field(..., description="List of messages") 
\ No newline at end of file
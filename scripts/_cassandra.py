@@ -0,0 +1,70 @@
+"""
+Shared Cassandra connection helpers for the Messenger scripts.
+"""
+import os
+import atexit
+import logging
+from cassandra.cluster import Cluster
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+
+logger = logging.getLogger(__name__)
+
+# Cassandra connection settings
+CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "localhost")
+CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
+
+# Replication used when a script creates its keyspace (update as needed)
+KEYSPACE_REPLICATION = "{'class': 'SimpleStrategy', 'replication_factor': '1'}"
+
+# Process-wide cluster and sessions, created on first use
+_cluster = None
+_sessions = {}
+
+def get_cluster():
+    """
+    Get the tuned Cluster for this process, creating it on first use.
+
+    Returns:
+        Cluster instance, shut down automatically at interpreter exit
+    """
+    global _cluster
+    if _cluster is None:
+        # Protocol v4 multiplexes up to 32768 concurrent requests over a single
+        # connection per host, which is what the concurrent writes rely on.
+        # The generated rows are highly repetitive, so compress the frames.
+        # Token-aware routing sends each prepared write straight to a replica.
+        _cluster = Cluster(
+            [CASSANDRA_HOST],
+            port=CASSANDRA_PORT,
+            protocol_version=4,
+            compression='lz4',
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()),
+            max_schema_agreement_wait=2
+        )
+        atexit.register(_cluster.shutdown)
+    return _cluster
+
+def get_session(keyspace=None):
+    """
+    Get a session on the shared cluster, connecting on first use.
+
+    The keyspace is created if it does not exist yet, so connecting never
+    depends on setup having run first.
+
+    Args:
+        keyspace: Keyspace to use for the session, or None for no keyspace
+
+    Returns:
+        Session bound to the requested keyspace
+    """
+    session = _sessions.get(keyspace)
+    if session is None:
+        session = get_cluster().connect()
+        if keyspace:
+            session.execute(f"""
+                CREATE KEYSPACE IF NOT EXISTS {keyspace}
+                WITH replication = {KEYSPACE_REPLICATION}
+            """)
+            session.set_keyspace(keyspace)
+        _sessions[keyspace] = session
+    return session
@@ -2,129 +2,332 @@
 Script to generate test data for the Messenger application.
 """
 import os
+import math
 import uuid
+import time
 import logging
 import random
-from datetime import datetime, timedelta
-from cassandra.cluster import Cluster
+from multiprocessing import Pool, util
+import numpy as np
+from cassandra import ConsistencyLevel
+from cassandra.concurrent import execute_concurrent, execute_concurrent_with_args
+from cassandra.query import BatchStatement, BatchType
+from _cassandra import get_cluster, get_session
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Cassandra connection settings
-CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "localhost")
-CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
 CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger_app")
 
 # Test data configuration
 NUM_USERS = 10  # Number of users to create
 NUM_CONVERSATIONS = 15  # Number of conversations to create
 MAX_MESSAGES_PER_CONVERSATION = 20  # Maximum number of messages per conversation
+WRITE_CONCURRENCY = 256  # Maximum number of concurrent write requests
+MAX_BATCH_SIZE = 100  # Maximum number of messages per single-partition batch
+NUM_WORKERS = os.cpu_count() or 1  # Number of generator processes
+
+# Write statements, prepared once per worker
+INSERT_MSG_CQL = """
+INSERT INTO messages_by_conversation (
+    conversation_id, message_timestamp, message_id, sender_id, message_text
+) VALUES (?, ?, ?, ?, ?)
+"""
+UPSERT_CONV_CQL = """
+INSERT INTO user_conversations (
+    user_id, last_activity, conversation_id, participant_ids, last_message_preview
+) VALUES (?, ?, ?, ?, ?)
+"""
+UPSERT_CONV_BY_ID_CQL = """
+INSERT INTO conversations_by_id (
+    conversation_id, participant_ids, last_activity, last_message_preview
+) VALUES (?, ?, ?, ?)
+"""
+INSERT_PAIR_CQL = """
+INSERT INTO conversation_by_user_pair (
+    user_low, user_high, conversation_id
+) VALUES (?, ?, ?)
+"""
+INCREMENT_COUNT_CQL = """
+UPDATE conversation_counters SET msg_count = msg_count + ?
+WHERE conversation_id = ?
+"""
+
+# Prepared statement handles, keyed by (session, CQL text)
+_PREPARED = {}
+
+# Per-process state: user IDs set by init_worker, Cassandra state
+# opened by the first task through get_worker_session
+_cluster = None
+_session = None
+_statements = None
+_user_ids = None
 
 def connect_to_cassandra():
     """Connect to Cassandra cluster."""
     logger.info("Connecting to Cassandra...")
     try:
-        cluster = Cluster([CASSANDRA_HOST])
-        session = cluster.connect(CASSANDRA_KEYSPACE)
+        cluster = get_cluster()
+        session = get_session(CASSANDRA_KEYSPACE)
         logger.info("Connected to Cassandra!")
         return cluster, session
     except Exception as e:
         logger.error(f"Failed to connect to Cassandra: {str(e)}")
         raise
 
-def generate_test_data(session):
-    """Generate test data for the messenger application."""
-    logger.info("Generating test data...")
+def prepare_cached(session, cql):
+    """Prepare a statement once per session and reuse the handle afterwards."""
+    key = (session, cql)
+    prepared = _PREPARED.get(key)
+    if prepared is None:
+        prepared = session.prepare(cql)
+        _PREPARED[key] = prepared
+    return prepared
+
+def prepare_statements(session):
+    """Prepare the write statements used by the generator."""
+    # Writes only need a single replica ack
+    insert_message_ps = prepare_cached(session, INSERT_MSG_CQL)
+    upsert_conversation_ps = prepare_cached(session, UPSERT_CONV_CQL)
+    upsert_conversation_by_id_ps = prepare_cached(session, UPSERT_CONV_BY_ID_CQL)
+    insert_pair_ps = prepare_cached(session, INSERT_PAIR_CQL)
+    increment_count_ps = prepare_cached(session, INCREMENT_COUNT_CQL)
+    statements = (insert_message_ps, upsert_conversation_ps, upsert_conversation_by_id_ps,
+                  insert_pair_ps, increment_count_ps)
+    for prepared in statements:
+        prepared.consistency_level = ConsistencyLevel.LOCAL_ONE
+    return statements
+
+def bulk_uuids(n):
+    """Generate n random (version 4) UUIDs from a single os.urandom call."""
+    buf = os.urandom(16 * n)
+    return [uuid.UUID(bytes=buf[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+def init_worker(user_ids):
+    """Set up the shared state of this worker process."""
+    global _user_ids
+    _user_ids = user_ids
+
+def get_worker_session():
+    """
+    Get this worker's Cassandra session, connecting on first use.
     
-    # Generate user IDs
-    user_ids = [uuid.uuid4() for _ in range(NUM_USERS)]
-    logger.info(f"Generated {len(user_ids)} users")
+    Connecting here rather than in the pool initializer lets a connection
+    failure reach the parent as a task error; a failing initializer makes
+    the pool restart workers forever.
+    
+    Returns:
+        Tuple of (session, prepared statements)
+    """
+    global _cluster, _session, _statements
+    if _session is None:
+        _cluster, _session = connect_to_cassandra()
+        _statements = prepare_statements(_session)
+        # Pool workers exit without running atexit hooks, so close the
+        # connection from a multiprocessing finalizer instead
+        util.Finalize(None, _cluster.shutdown, exitpriority=10)
+    return _session, _statements
+
+def generate_conversations(task):
+    """
+    Generate and write a chunk of conversations in a worker process.
+    
+    Args:
+        task: Tuple of (random seed, number of conversations)
+        
+    Returns:
+        Number of messages written
+    """
+    seed, num_conversations = task
+    session, statements = get_worker_session()
+    user_ids = _user_ids
+    (insert_message_ps, upsert_conversation_ps, upsert_conversation_by_id_ps,
+     insert_pair_ps, increment_count_ps) = statements
+    
+    # Draw every random field for the task up front in vectorized form.
+    # Forked workers share the parent's random state, so seed per task.
+    rng = np.random.default_rng(seed)
+    max_participants = min(4, NUM_USERS)
+    max_messages = MAX_MESSAGES_PER_CONVERSATION
+    # 2-4 participants, taken from a random permutation of the users
+    participant_counts = rng.integers(2, max_participants + 1, size=num_conversations)
+    participant_idx = rng.random((num_conversations, NUM_USERS)).argsort(axis=1)[:, :max_participants]
+    message_counts = rng.integers(5, max_messages + 1, size=num_conversations)
+    # Base timestamp for each conversation (between 1-30 days ago)
+    now_ms = int(time.time() * 1000)
+    start_ms = now_ms - rng.integers(1, 31, size=num_conversations, dtype=np.int64) * 86_400_000
+    # Each message is 1-30 minutes after the previous one
+    offsets_ms = rng.integers(1, 31, size=(num_conversations, max_messages), dtype=np.int64).cumsum(axis=1) * 60_000
+    # TIMESTAMP columns take plain int milliseconds since the epoch, so
+    # convert to Python ints once instead of building datetimes per message
+    timestamps_ms = (start_ms[:, None] + offsets_ms).tolist()
+    sender_idx = rng.integers(0, participant_counts[:, None], size=(num_conversations, max_messages))
+    # One ID per conversation and per message
+    new_ids = iter(bulk_uuids(num_conversations + int(message_counts.sum())))
     
-    # Log the user IDs for future reference
-    for i, uid in enumerate(user_ids):
-        logger.info(f"User {i+1}: {uid}")
+    # Messages are written first, across all conversations, then the
+    # per-conversation rows, so each phase keeps its partitions together
+    # and no conversation is listed before its messages exist
+    message_batches = []
+    conv_params = []
+    conversation_writes = []
     
-    conversations = []
-    # Create conversations
-    for _ in range(NUM_CONVERSATIONS):
-        # Select 2-4 random participants
-        num_participants = random.randint(2, min(4, NUM_USERS))
-        participants = random.sample(user_ids, num_participants)
-        conversation_id = uuid.uuid4()
-        conversations.append((conversation_id, participants))
+    for conv_idx in range(num_conversations):
+        participants = [user_ids[i] for i in participant_idx[conv_idx, :participant_counts[conv_idx]]]
+        # participant_ids is a frozen list kept in sorted order, so build
+        # the immutable value once and share it across every row
+        sorted_participants = tuple(sorted(participants))
+        conversation_id = next(new_ids)
         
-        # Log the conversation details
-        logger.info(f"Conversation {conversation_id} with participants: {participants}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Conversation {conversation_id} with participants: {participants}")
         
-        # Generate messages for this conversation
-        num_messages = random.randint(5, MAX_MESSAGES_PER_CONVERSATION)
+        num_messages = int(message_counts[conv_idx])
+        # Only the message number varies, so format the UUID once
+        message_suffix = f" in conversation {conversation_id}"
         
-        # Base timestamp for this conversation (between 1-30 days ago)
-        start_time = datetime.utcnow() - timedelta(days=random.randint(1, 30))
+        # All messages of a conversation share its partition, so group them
+        # into unlogged batches that go to a single replica set
+        message_batch = BatchStatement(
+            batch_type=BatchType.UNLOGGED,
+            consistency_level=ConsistencyLevel.LOCAL_ONE
+        )
         
         for msg_idx in range(num_messages):
-            # Each message is 1-30 minutes after the previous one
-            message_timestamp = start_time + timedelta(minutes=msg_idx * random.randint(1, 30))
-            
-            # Select a random sender from participants
-            sender_id = random.choice(participants)
+            message_timestamp = timestamps_ms[conv_idx][msg_idx]
+            sender_id = participants[sender_idx[conv_idx, msg_idx]]
             
             # Generate a message
-            message_id = uuid.uuid4()
-            message_text = f"Test message {msg_idx+1} in conversation {conversation_id}"
+            message_id = next(new_ids)
+            message_text = f"Test message {msg_idx+1}{message_suffix}"
             
             # Insert message into messages_by_conversation
-            insert_message_query = """
-            INSERT INTO messages_by_conversation (
-                conversation_id, message_timestamp, message_id, sender_id, message_text
-            ) VALUES (%s, %s, %s, %s, %s)
-            """
-            session.execute(insert_message_query, (
+            message_batch.add(insert_message_ps, (
                 conversation_id,
                 message_timestamp,
                 message_id,
                 sender_id,
                 message_text
             ))
-            
-            # For the last message, update user_conversations for each participant
-            if msg_idx == num_messages - 1:
-                for user_id in participants:
-                    upsert_conversation_query = """
-                    INSERT INTO user_conversations (
-                        user_id, last_activity, conversation_id, participant_ids, last_message_preview
-                    ) VALUES (%s, %s, %s, %s, %s)
-                    """
-                    session.execute(upsert_conversation_query, (
-                        user_id,
-                        message_timestamp,
-                        conversation_id,
-                        set(participants),
-                        message_text[:100]
-                    ))
+            if len(message_batch) >= MAX_BATCH_SIZE:
+                message_batches.append((message_batch, None))
+                message_batch = BatchStatement(
+                    batch_type=BatchType.UNLOGGED,
+                    consistency_level=ConsistencyLevel.LOCAL_ONE
+                )
+        
+        if len(message_batch):
+            message_batches.append((message_batch, None))
+        
+        # The last message becomes the conversation's latest activity
+        preview = message_text if len(message_text) <= 100 else message_text[:100]
+        
+        # Update user_conversations for each participant
+        for user_id in participants:
+            conv_params.append((
+                user_id,
+                message_timestamp,
+                conversation_id,
+                sorted_participants,
+                preview
+            ))
+        
+        conversation_writes.append((upsert_conversation_by_id_ps, (
+            conversation_id,
+            sorted_participants,
+            message_timestamp,
+            preview
+        )))
+        
+        # One-to-one conversations are also reachable by user pair
+        if len(participants) == 2:
+            user_low, user_high = sorted_participants
+            conversation_writes.append((insert_pair_ps, (
+                user_low,
+                user_high,
+                conversation_id
+            )))
+        
+        # Keep the message counter in step with the inserted messages
+        conversation_writes.append((increment_count_ps, (num_messages, conversation_id)))
+    
+    def check(results):
+        failures = [result for success, result in results if not success]
+        if failures:
+            raise Exception(f"{len(failures)} writes failed, first error: {failures[0]}")
+    
+    check(execute_concurrent(
+        session,
+        message_batches,
+        concurrency=WRITE_CONCURRENCY,
+        raise_on_first_error=False,
+        results_generator=True
+    ))
+    check(execute_concurrent_with_args(
+        session,
+        upsert_conversation_ps,
+        conv_params,
+        concurrency=WRITE_CONCURRENCY,
+        raise_on_first_error=False,
+        results_generator=True
+    ))
+    check(execute_concurrent(
+        session,
+        conversation_writes,
+        concurrency=WRITE_CONCURRENCY,
+        raise_on_first_error=False,
+        results_generator=True
+    ))
     
-    logger.info(f"Generated {NUM_CONVERSATIONS} conversations with {MAX_MESSAGES_PER_CONVERSATION} messages each")
+    return int(message_counts.sum())
+
+def generate_test_data():
+    """Generate test data for the messenger application."""
+    logger.info("Generating test data...")
+    
+    # Generate user IDs
+    user_ids = bulk_uuids(NUM_USERS)
+    # Log the user IDs for future reference, once on a single line
+    logger.info("Generated %d users: %s", len(user_ids), ", ".join(str(uid) for uid in user_ids))
+    
+    # Split the conversations into independent, separately seeded tasks,
+    # one per worker so every process gets a share of the work
+    conversations_per_task = max(1, math.ceil(NUM_CONVERSATIONS / NUM_WORKERS))
+    tasks = [
+        (random.getrandbits(64), min(conversations_per_task, NUM_CONVERSATIONS - start))
+        for start in range(0, NUM_CONVERSATIONS, conversations_per_task)
+    ]
+    
+    # Each worker opens its own Cassandra session on its first task
+    pool = Pool(
+        processes=min(NUM_WORKERS, len(tasks)),
+        initializer=init_worker,
+        initargs=(user_ids,)
+    )
+    try:
+        total_messages = sum(pool.imap_unordered(generate_conversations, tasks))
+    except Exception:
+        # Don't wait for the remaining tasks once one has failed
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+    
+    logger.info("Generated %d conversations, %d messages", NUM_CONVERSATIONS, total_messages)
     logger.info("User IDs have been logged above for testing API endpoints")
 
 def main():
     """Main function to generate test data."""
-    cluster = None
-    
     try:
-        # Connect to Cassandra
-        cluster, session = connect_to_cassandra()
-        
         # Generate test data
-        generate_test_data(session)
+        generate_test_data()
         
         logger.info("Test data generation completed successfully!")
     except Exception as e:
         logger.error(f"Error generating test data: {str(e)}")
-    finally:
-        if cluster:
-            cluster.shutdown()
-            logger.info("Cassandra connection closed")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,31 +4,20 @@ Script to initialize Cassandra keyspace and tables for the Messenger application
 import os
 import time
 import logging
-from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.query import SimpleStatement
+from _cassandra import get_session
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Cassandra connection settings
-CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "127.0.0.1")
-CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
-CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger")
+CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger_app")
 
 def create_tables():
-    # Connect to your Cassandra cluster (change contact_points as needed)
-    cluster = Cluster(contact_points=[CASSANDRA_HOST])
-    session = cluster.connect()
-
-    # Create or use an existing keyspace (update replication settings as needed)
-    session.execute("""
-        CREATE KEYSPACE IF NOT EXISTS messenger_app
-        WITH replication = {'class': 'SimpleStrategy', 'replication_factor': '1'}
-    """)
-
-    # Switch to the keyspace
-    session.set_keyspace('messenger_app')
+    # Connect to your Cassandra cluster (set CASSANDRA_HOST as needed),
+    # creating the keyspace if it does not exist and switching to it
+    session = get_session(CASSANDRA_KEYSPACE)
 
     # Create messages_by_conversation table
     create_messages_table = """
@@ -42,7 +31,6 @@ def create_tables():
     )
     WITH CLUSTERING ORDER BY (message_timestamp DESC, message_id ASC);
     """
-    session.execute(SimpleStatement(create_messages_table))
 
     # Create user_conversations table
     create_user_conversations_table = """
@@ -50,20 +38,58 @@ def create_tables():
         user_id UUID,
         last_activity TIMESTAMP,
         conversation_id UUID,
-        participant_ids SET<UUID>,
+        participant_ids FROZEN<LIST<UUID>>,
         last_message_preview TEXT,
         PRIMARY KEY (user_id, last_activity, conversation_id)
     )
     WITH CLUSTERING ORDER BY (last_activity DESC);
     """
-    session.execute(SimpleStatement(create_user_conversations_table))
+
+    # Create conversations_by_id table
+    create_conversations_by_id_table = """
+    CREATE TABLE IF NOT EXISTS conversations_by_id (
+        conversation_id UUID PRIMARY KEY,
+        participant_ids FROZEN<LIST<UUID>>,
+        last_activity TIMESTAMP,
+        last_message_preview TEXT
+    );
+    """
+
+    # Create conversation_by_user_pair table
+    create_conversation_by_user_pair_table = """
+    CREATE TABLE IF NOT EXISTS conversation_by_user_pair (
+        user_low UUID,
+        user_high UUID,
+        conversation_id UUID,
+        PRIMARY KEY ((user_low, user_high))
+    );
+    """
+
+    # Create conversation_counters table
+    create_conversation_counters_table = """
+    CREATE TABLE IF NOT EXISTS conversation_counters (
+        conversation_id UUID PRIMARY KEY,
+        msg_count COUNTER
+    );
+    """
+
+    # The tables are independent, so create them concurrently once the
+    # keyspace exists and wait for all of them to finish
+    futures = [
+        session.execute_async(SimpleStatement(statement))
+        for statement in (
+            create_messages_table,
+            create_user_conversations_table,
+            create_conversations_by_id_table,
+            create_conversation_by_user_pair_table,
+            create_conversation_counters_table,
+        )
+    ]
+    for future in futures:
+        future.result()
 
     # (Optional) Confirm creation
     print("Tables created successfully!")
 
-    # Close the session and cluster
-    session.shutdown()
-    cluster.shutdown()
-
 if __name__ == "__main__":
     create_tables()
@@ -0,0 +1,9 @@
+"""
+Shared test setup.
+"""
+from unittest import mock
+
+# The Cassandra client connects when app.db.cassandra_client is imported.
+# Tests stub out the queries they exercise, so hand it a fake cluster
+# instead of requiring a running database.
+mock.patch("cassandra.cluster.Cluster").start()
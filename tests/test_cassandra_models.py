@@ -0,0 +1,148 @@
+"""
+Tests for the Cassandra models.
+"""
+import asyncio
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from app.models import cassandra_models
+from app.models.cassandra_models import (
+    ConversationModel,
+    MessageModel,
+    decode_conversation_cursor,
+    decode_message_cursor,
+    encode_message_cursor,
+)
+
+
+def _record_queries(monkeypatch):
+    """Replace query execution with a stub that records bound parameters."""
+    calls = []
+
+    async def fake_execute_async(query, params=None):
+        calls.append(params)
+        return []
+
+    monkeypatch.setattr(cassandra_models.cassandra_client, "execute_async", fake_execute_async)
+    monkeypatch.setattr(cassandra_models, "_prepare_page_query", lambda query, limit: query)
+    return calls
+
+
+def test_messages_before_aware_timestamp(monkeypatch):
+    calls = _record_queries(monkeypatch)
+    before_timestamp = datetime(2024, 1, 2, 1, 0, tzinfo=timezone(timedelta(hours=1)))
+
+    rows, next_cursor = asyncio.run(MessageModel.get_messages_before_timestamp(
+        conversation_id=uuid4(),
+        before_timestamp=before_timestamp
+    ))
+
+    assert (rows, next_cursor) == ([], None)
+    # Bound as naive UTC, like the values the driver returns
+    assert calls[0][1] == datetime(2024, 1, 2)
+
+
+def test_messages_before_aware_timestamp_with_cursor(monkeypatch):
+    calls = _record_queries(monkeypatch)
+    cursor_timestamp = datetime(2024, 1, 1, 12, 0)
+    cursor = encode_message_cursor(cursor_timestamp, uuid4())
+    decoded_timestamp, decoded_message_id = decode_message_cursor(cursor)
+
+    rows, next_cursor = asyncio.run(MessageModel.get_messages_before_timestamp(
+        conversation_id=uuid4(),
+        before_timestamp=datetime(2024, 1, 2, tzinfo=timezone.utc),
+        page=2,
+        cursor_timestamp=decoded_timestamp,
+        cursor_message_id=decoded_message_id
+    ))
+
+    assert (rows, next_cursor) == ([], None)
+    # Both the tie-break and the older-page queries start at the cursor
+    assert len(calls) == 2
+    assert all(params[1] == cursor_timestamp for params in calls)
+
+
+def test_user_conversations_cursor_keeps_activity_ties(monkeypatch):
+    Row = namedtuple("Row", "user_id last_activity conversation_id participant_ids last_message_preview")
+    user_id = uuid4()
+    activity = datetime(2024, 1, 1, 12, 0)
+    first, tied, older = sorted([uuid4(), uuid4()]) + [uuid4()]
+    rows_by_query = {
+        cassandra_models._SELECT_USER_CONVERSATIONS_CQL: [
+            Row(user_id, activity, first, [], None),
+            Row(user_id, activity, tied, [], None),
+        ],
+        cassandra_models._SELECT_USER_CONVERSATIONS_AT_CQL: [
+            Row(user_id, activity, tied, [], None),
+        ],
+        cassandra_models._SELECT_USER_CONVERSATIONS_BEFORE_CQL: [
+            Row(user_id, activity - timedelta(minutes=1), older, [], None),
+        ],
+    }
+
+    async def fake_execute_async(query, params=None):
+        return list(rows_by_query[query])
+
+    monkeypatch.setattr(cassandra_models.cassandra_client, "execute_async", fake_execute_async)
+    monkeypatch.setattr(cassandra_models, "_prepare_page_query", lambda query, limit: query)
+
+    rows, next_cursor = asyncio.run(ConversationModel.get_user_conversations(user_id=user_id, limit=1))
+    assert [row.conversation_id for row in rows] == [first]
+
+    cursor_activity, cursor_conversation_id = decode_conversation_cursor(next_cursor)
+    assert (cursor_activity, cursor_conversation_id) == (activity, first)
+
+    rows, next_cursor = asyncio.run(ConversationModel.get_user_conversations(
+        user_id=user_id,
+        page=2,
+        limit=1,
+        cursor_activity=cursor_activity,
+        cursor_conversation_id=cursor_conversation_id
+    ))
+    # The conversation sharing the boundary's activity is not skipped
+    assert [row.conversation_id for row in rows] == [tied]
+    assert next_cursor is not None
+
+
+def test_create_conversation_releases_pair_when_batch_fails(monkeypatch):
+    PairResult = namedtuple("PairResult", "applied user_low user_high conversation_id")
+    executed = []
+
+    async def fake_execute_async(query, params=None):
+        executed.append(query)
+        if query == cassandra_models._SELECT_CONVERSATION_BY_PAIR_CQL:
+            return []
+        if query == cassandra_models._INSERT_CONVERSATION_BY_PAIR_CQL:
+            return [PairResult(True, None, None, None)]
+        if query == cassandra_models._DELETE_CONVERSATION_BY_PAIR_CQL:
+            return [PairResult(True, None, None, None)]
+        raise RuntimeError("batch failed")
+
+    monkeypatch.setattr(cassandra_models.cassandra_client, "execute_async", fake_execute_async)
+    monkeypatch.setattr(cassandra_models.cassandra_client, "prepare", lambda query: query)
+    monkeypatch.setattr(cassandra_models, "BatchStatement", mock.MagicMock)
+
+    with pytest.raises(Exception, match="batch failed"):
+        asyncio.run(ConversationModel.create_or_get_conversation(uuid4(), uuid4()))
+
+    # The claim is dropped so a later call can create the conversation again
+    assert executed[-1] == cassandra_models._DELETE_CONVERSATION_BY_PAIR_CQL
+
+
+def test_page_queries_use_a_fixed_set_of_limits(monkeypatch):
+    prepared = {}
+    monkeypatch.setattr(
+        cassandra_models.cassandra_client,
+        "prepare",
+        lambda query: prepared.setdefault(query, mock.MagicMock())
+    )
+
+    for limit in range(1, cassandra_models.MAX_PAGE_SIZE + 2):
+        statement = cassandra_models._prepare_page_query(cassandra_models._SELECT_MESSAGES_CQL, limit)
+        assert statement.fetch_size >= limit
+
+    assert len(prepared) == len(cassandra_models.PAGE_FETCH_SIZES)